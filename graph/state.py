@@ -1,8 +1,7 @@
 """
 State definitions for the LangGraph honeypot system
 """
-from typing import TypedDict, List, Annotated
-import operator
+from typing import TypedDict, List
 
 
 class Message(TypedDict):
@@ -25,7 +24,10 @@ class HoneypotState(TypedDict):
     """Main state for the honeypot agent workflow"""
     sessionId: str
     currentMessage: Message
-    conversationHistory: Annotated[List[Message], operator.add]
+    # Plain lists: nodes mutate the shared state dict in place and return
+    # the full state, so an operator.add reducer would re-concatenate the
+    # whole list on every node hop and duplicate entries
+    conversationHistory: List[Message]
     metadata: dict
     scamDetected: bool
     scamScore: float  # 0.0 to 1.0
@@ -33,8 +35,11 @@ class HoneypotState(TypedDict):
     agentPersona: str
     conversationStrategy: str
     detectedLanguage: str  # Detected language of conversation
+    langLocked: bool  # Language confidently detected, skip re-detection
     totalMessagesExchanged: int
-    agentNotes: Annotated[List[str], operator.add]
+    intelScanSeeded: bool  # Provided history already regex-scanned once
+    historyFormatCache: dict  # Formatted history lines, keyed by length
+    agentNotes: List[str]
     agentReply: str
     shouldContinue: bool
     finalPayloadSent: bool
@@ -1,38 +1,32 @@
 """
 LangGraph workflow construction
 """
+import threading
+
 from langgraph.graph import StateGraph, END
 from graph.state import HoneypotState
 from graph.nodes import (
-    scam_detection_node,
-    language_detection_node,
+    detection_node,
     persona_selection_node,
-    response_generation_node,
-    intelligence_extraction_node,
+    engagement_node,
     continuation_decision_node,
     send_final_payload_node
 )
 
 
 def route_after_detection(state: HoneypotState) -> str:
-    """Route based on scam detection"""
-    if state["scamDetected"]:
-        # Always go to language detection first
-        return "language_detection"
-    else:
+    """Route based on scam detection (language already settled inside detection)"""
+    if not state["scamDetected"]:
         # Not a scam - send neutral response and end
         state["agentReply"] = "Thank you for your message. I'll look into this."
         return "end"
 
-
-def route_after_language_detection(state: HoneypotState) -> str:
-    """Route after language detection"""
     # Check if persona already selected (for subsequent messages)
     if state.get("agentPersona", "") == "":
         return "persona_selection"
     else:
-        # Skip persona selection, go straight to response
-        return "response_generation"
+        # Skip persona selection, go straight to engagement
+        return "engagement"
 
 
 def route_after_decision(state: HoneypotState) -> str:
@@ -53,39 +47,30 @@ def create_honeypot_graph():
     workflow = StateGraph(HoneypotState)
     
     # Add nodes
-    workflow.add_node("scam_detection", scam_detection_node)
-    workflow.add_node("language_detection", language_detection_node)
+    workflow.add_node("detection", detection_node)
     workflow.add_node("persona_selection", persona_selection_node)
-    workflow.add_node("response_generation", response_generation_node)
-    workflow.add_node("intelligence_extraction", intelligence_extraction_node)
+    # Engagement fuses response generation + intelligence extraction so
+    # their Groq calls overlap
+    workflow.add_node("engagement", engagement_node)
     workflow.add_node("continuation_decision", continuation_decision_node)
     workflow.add_node("send_final_payload", send_final_payload_node)
     
     # Set entry point
-    workflow.set_entry_point("scam_detection")
-    
+    workflow.set_entry_point("detection")
+
     # Add edges
     workflow.add_conditional_edges(
-        "scam_detection",
+        "detection",
         route_after_detection,
-        {
-            "language_detection": "language_detection",
-            "end": END
-        }
-    )
-    
-    workflow.add_conditional_edges(
-        "language_detection",
-        route_after_language_detection,
         {
             "persona_selection": "persona_selection",
-            "response_generation": "response_generation"
+            "engagement": "engagement",
+            "end": END
         }
     )
-    
-    workflow.add_edge("persona_selection", "response_generation")
-    workflow.add_edge("response_generation", "intelligence_extraction")
-    workflow.add_edge("intelligence_extraction", "continuation_decision")
+
+    workflow.add_edge("persona_selection", "engagement")
+    workflow.add_edge("engagement", "continuation_decision")
     
     workflow.add_conditional_edges(
         "continuation_decision",
@@ -99,3 +84,24 @@ def create_honeypot_graph():
     workflow.add_edge("send_final_payload", END)
     
     return workflow.compile()
+
+
+# Process-wide compiled graph - compilation validates nodes/edges and
+# should happen once at startup, not per session
+_compiled_graph = None
+_compile_lock = threading.Lock()
+
+
+def get_honeypot_graph():
+    """
+    Return the shared compiled workflow, building it on first use
+
+    Returns:
+        Compiled LangGraph workflow (singleton)
+    """
+    global _compiled_graph
+    if _compiled_graph is None:
+        with _compile_lock:
+            if _compiled_graph is None:
+                _compiled_graph = create_honeypot_graph()
+    return _compiled_graph
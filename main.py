@@ -1,29 +1,65 @@
 """
 FastAPI server for the LangGraph honeypot system
 """
+import logging
 import os
 from fastapi import FastAPI, Header, HTTPException
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
 from typing import List, Optional
 import uvicorn
 from dotenv import load_dotenv
 
-from graph.workflow import create_honeypot_graph
+from graph.workflow import get_honeypot_graph
+from utils.session_store import get_session_store
 
 # Load environment variables
 load_dotenv()
 
 # Initialize FastAPI app
-app = FastAPI(title="Honeypot Scam Detection API")
+# ORJSONResponse serializes through orjson's C encoder and skips the
+# UTF-8 re-encode in the default JSONResponse path
+app = FastAPI(title="Honeypot Scam Detection API", default_response_class=ORJSONResponse)
 
 # API key for authentication
 API_KEY = os.getenv("API_KEY", "your-secret-api-key")
 
-# Create the LangGraph workflow
-honeypot_graph = create_honeypot_graph()
+# Per-turn chatter is DEBUG/INFO and suppressed by default, so the hot
+# path does no stdout I/O; raise LOG_LEVEL locally when debugging
+logging.basicConfig(format="%(asctime)s %(name)s %(levelname)s %(message)s")
+logger = logging.getLogger("honeypot")
+logger.setLevel(os.getenv("LOG_LEVEL", "WARNING").upper())
 
-# Store active sessions in memory (use Redis/database in production)
-sessions = {}
+# Shared compiled LangGraph workflow (compiled once per process)
+honeypot_graph = get_honeypot_graph()
+
+# Session state store: Redis with 24h TTL when REDIS_URL is set,
+# in-memory dict fallback for local development
+sessions = get_session_store()
+
+# History is windowed once it exceeds MAX_HISTORY_MESSAGES: state size,
+# serialization bytes, and prompt prefill all grow with every turn
+MAX_HISTORY_MESSAGES = 40
+HISTORY_WINDOW = 20
+
+
+@app.on_event("startup")
+async def expand_threadpool():
+    """
+    Raise the event loop's default-executor thread limit
+
+    The graph itself is awaited (ainvoke), but LangGraph dispatches the
+    remaining sync nodes (continuation decision, final payload send)
+    through loop.run_in_executor(None, ...), whose default pool caps at
+    min(32, cpus + 4) threads and becomes the concurrency ceiling under
+    load.
+    """
+    import asyncio
+    from concurrent.futures import ThreadPoolExecutor
+    loop = asyncio.get_running_loop()
+    loop.set_default_executor(
+        ThreadPoolExecutor(max_workers=200, thread_name_prefix="sync-node")
+    )
 
 
 # Request/Response models
@@ -57,76 +93,106 @@ async def handle_message(
     if x_api_key != API_KEY:
         raise HTTPException(status_code=401, detail="Invalid API key")
     
-    print(f"\n📨 Received message for session: {request.sessionId}")
-    print(f"   Message: {request.message.text[:100]}...")
-    
-    # Initialize or retrieve session state
-    if request.sessionId not in sessions:
-        print(f"🆕 New session created: {request.sessionId}")
-        
-        sessions[request.sessionId] = {
-            "sessionId": request.sessionId,
-            "currentMessage": request.message.dict(),
-            "conversationHistory": [msg.dict() for msg in request.conversationHistory],
-            "metadata": request.metadata,
-            "scamDetected": False,
-            "scamScore": 0.0,
-            "extractedIntelligence": {
-                "bankAccounts": [],
-                "upiIds": [],
-                "phishingLinks": [],
-                "phoneNumbers": [],
-                "suspiciousKeywords": []
-            },
-            "agentPersona": "",
-            "conversationStrategy": "",
-            "detectedLanguage": "en",  # Default to English
-            "totalMessagesExchanged": len(request.conversationHistory) + 1,
-            "agentNotes": [],
-            "agentReply": "",
-            "shouldContinue": True,
-            "finalPayloadSent": False
-        }
-    else:
-        # Update existing session
-        print(f"🔄 Continuing session: {request.sessionId} (Turn {sessions[request.sessionId]['totalMessagesExchanged'] + 1})")
-        
-        sessions[request.sessionId]["currentMessage"] = request.message.dict()
-        sessions[request.sessionId]["conversationHistory"].append(request.message.dict())
-        sessions[request.sessionId]["totalMessagesExchanged"] += 1
-    
-    try:
-        # Run through LangGraph workflow
-        print(f"🤖 Processing through LangGraph workflow...")
-        result = honeypot_graph.invoke(sessions[request.sessionId])
-        
-        # Update session with result
-        sessions[request.sessionId] = result
-        
-        # Extract agent reply
-        agent_reply = result.get("agentReply", "I understand. Could you provide more details?")
-        
-        print(f"✅ Response generated: {agent_reply[:100]}...")
-        
-        # Check if conversation ended
-        if not result.get("shouldContinue", True):
-            print(f"🛑 Conversation ended for session {request.sessionId}")
-        
-        return MessageResponse(
-            status="success",
-            reply=agent_reply
-        )
-        
-    except Exception as e:
-        print(f"❌ Error processing message: {str(e)}")
-        import traceback
-        traceback.print_exc()
-        
-        # Fallback response
-        return MessageResponse(
-            status="success",
-            reply="I'm having trouble understanding. Could you explain again?"
-        )
+    logger.debug("📨 Received message for session %s: %.100s", request.sessionId, request.message.text)
+
+    # Serialize the incoming message once; it's reused in both branches
+    message_dict = request.message.dict()
+
+    # Serialize concurrent turns for the same session - parallel
+    # read-modify-write cycles would corrupt the conversation state
+    async with sessions.lock(request.sessionId):
+        # Initialize or retrieve session state
+        state = await sessions.get(request.sessionId)
+        if state is None:
+            logger.info("🆕 New session created: %s", request.sessionId)
+
+            state = {
+                "sessionId": request.sessionId,
+                "currentMessage": message_dict,
+                "conversationHistory": [msg.dict() for msg in request.conversationHistory],
+                "metadata": request.metadata,
+                "scamDetected": False,
+                "scamScore": 0.0,
+                "extractedIntelligence": {
+                    "bankAccounts": [],
+                    "upiIds": [],
+                    "phishingLinks": [],
+                    "phoneNumbers": [],
+                    "suspiciousKeywords": []
+                },
+                "agentPersona": "",
+                "conversationStrategy": "",
+                "detectedLanguage": "en",  # Default to English
+                "langLocked": False,
+                "totalMessagesExchanged": len(request.conversationHistory) + 1,
+                "intelScanSeeded": False,
+                "historyFormatCache": {},
+                "agentNotes": [],
+                "agentReply": "",
+                "shouldContinue": True,
+                "finalPayloadSent": False
+            }
+        else:
+            # Update existing session
+            logger.debug("🔄 Continuing session: %s (Turn %d)", request.sessionId, state['totalMessagesExchanged'] + 1)
+
+            state["currentMessage"] = message_dict
+            state["conversationHistory"].append(message_dict)
+            state["totalMessagesExchanged"] += 1
+
+            # Slide the history window; intelligence from old turns has
+            # already been merged into extractedIntelligence, so dropped
+            # messages carry nothing the pipeline still needs
+            history = state["conversationHistory"]
+            if len(history) > MAX_HISTORY_MESSAGES:
+                dropped = len(history) - HISTORY_WINDOW
+                state["conversationHistory"] = [{
+                    "sender": "system",
+                    "text": f"[{dropped} earlier messages truncated]",
+                    "timestamp": history[0]["timestamp"]
+                }] + history[-HISTORY_WINDOW:]
+
+        try:
+            # Run through LangGraph workflow (async so the detection LLM
+            # calls inside can overlap via asyncio.gather)
+            logger.debug("🤖 Processing through LangGraph workflow...")
+            result = await honeypot_graph.ainvoke(state)
+
+            # The rendered-history cache is a per-turn, in-process
+            # optimization - persisting it would double the history
+            # bytes in every session blob
+            result.pop("historyFormatCache", None)
+
+            # Update session with result
+            await sessions.set(request.sessionId, result)
+
+            # Extract agent reply
+            agent_reply = result.get("agentReply", "I understand. Could you provide more details?")
+
+            logger.debug("✅ Response generated: %.100s", agent_reply)
+
+            # Check if conversation ended
+            if not result.get("shouldContinue", True):
+                logger.info("🛑 Conversation ended for session %s", request.sessionId)
+
+            return MessageResponse(
+                status="success",
+                reply=agent_reply
+            )
+
+        except Exception:
+            logger.exception("❌ Error processing message for session %s", request.sessionId)
+
+            # Persist the pre-workflow state so the turn count and history
+            # survive the failed turn
+            state.pop("historyFormatCache", None)
+            await sessions.set(request.sessionId, state)
+
+            # Fallback response
+            return MessageResponse(
+                status="success",
+                reply="I'm having trouble understanding. Could you explain again?"
+            )
 
 
 @app.get("/health")
@@ -134,7 +200,7 @@ async def health_check():
     """Health check endpoint"""
     return {
         "status": "healthy",
-        "active_sessions": len(sessions),
+        "active_sessions": await sessions.count(),
         "groq_configured": bool(os.getenv("GROQ_API_KEY"))
     }
 
@@ -145,14 +211,35 @@ async def get_session(session_id: str, x_api_key: str = Header(...)):
     if x_api_key != API_KEY:
         raise HTTPException(status_code=401, detail="Invalid API key")
     
-    if session_id not in sessions:
+    state = await sessions.get(session_id)
+    if state is None:
         raise HTTPException(status_code=404, detail="Session not found")
-    
-    return sessions[session_id]
+
+    return state
 
 
 if __name__ == "__main__":
     print("🚀 Starting Honeypot Scam Detection API...")
     print(f"   Groq API configured: {bool(os.getenv('GROQ_API_KEY'))}")
     
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    # One worker per core parallelizes the CPU-bound parts (regex
+    # extraction, serialization) across processes. Workers only share
+    # sessions through Redis, so without REDIS_URL the server stays
+    # single-process unless WEB_CONCURRENCY explicitly overrides it.
+    default_workers = (os.cpu_count() or 1) if os.getenv("REDIS_URL") else 1
+    workers = int(os.getenv("WEB_CONCURRENCY", default_workers))
+
+    # uvloop + httptools (from uvicorn[standard]) swap the pure-Python
+    # event loop and h11 parser for C implementations; access logging is
+    # off since every request is already logged with more context.
+    # String import form so the app can be forked across workers.
+    uvicorn.run(
+        "main:app",
+        host="0.0.0.0",
+        port=8000,
+        workers=workers,
+        loop="uvloop",
+        http="httptools",
+        access_log=False,
+        log_level="warning"
+    )
@@ -1,47 +1,55 @@
 """
 Multilingual test scenarios for the honeypot system
+
+The three language scenarios run concurrently over one
+httpx.AsyncClient; each buffers its own transcript and prints it when
+finished so concurrent output doesn't interleave. Set REALISTIC=1 to
+restore the human-like 2s pause between messages.
 """
-import requests
-import time
+import asyncio
 import os
+import time
+
+import httpx
 from dotenv import load_dotenv
 
 # Load environment variables
 load_dotenv()
 
-API_URL = "http://localhost:8000/api/honeypot"
+BASE_URL = "http://localhost:8000"
 API_KEY = os.getenv("API_KEY", "your_honeypot_api_key")
 
+REALISTIC = bool(os.getenv("REALISTIC"))
+
 
-def test_hindi_scam():
+async def run_scenario(client, name, session_id, scammer_messages, metadata):
     """
-    Test Hindi language scam detection
+    Drive one scam conversation and return its printable transcript
+
+    Args:
+        client: Shared httpx.AsyncClient
+        name: Scenario title for the banner
+        session_id: Honeypot session id
+        scammer_messages: Scripted scammer turns
+        metadata: Channel/language metadata for every turn
+
+    Returns:
+        Buffered transcript string for this scenario
     """
-    print("\n" + "="*60)
-    print("TEST: Hindi Bank Fraud Scam")
-    print("="*60)
-    
-    session_id = f"test-hindi-{int(time.time())}"
-    
-    scammer_messages = [
-        "आपका बैंक खाता ब्लॉक हो जाएगा। तुरंत वेरिफाई करें।",
-        "अपना अकाउंट नंबर और UPI PIN भेजें।",
-        "9876543210 पर कॉल करें।"
-    ]
-    
+    lines = []
+    lines.append("\n" + "="*60)
+    lines.append(f"TEST: {name}")
+    lines.append("="*60)
+
     conversation_history = []
-    
+
     for i, msg in enumerate(scammer_messages):
-        print(f"\n{'─'*60}")
-        print(f"Turn {i+1}: Scammer: {msg}")
-        
+        lines.append(f"\n{'─'*60}")
+        lines.append(f"Turn {i+1}: Scammer: {msg}")
+
         try:
-            response = requests.post(
-                API_URL,
-                headers={
-                    "x-api-key": API_KEY,
-                    "Content-Type": "application/json"
-                },
+            response = await client.post(
+                "/api/honeypot",
                 json={
                     "sessionId": session_id,
                     "message": {
@@ -50,18 +58,14 @@ def test_hindi_scam():
                         "timestamp": int(time.time() * 1000)
                     },
                     "conversationHistory": conversation_history,
-                    "metadata": {
-                        "channel": "SMS",
-                        "language": "Hindi"
-                    }
-                },
-                timeout=30
+                    "metadata": metadata
+                }
             )
-            
+
             if response.status_code == 200:
                 data = response.json()
-                print(f"Agent: {data['reply']}")
-                
+                lines.append(f"Agent: {data['reply']}")
+
                 conversation_history.append({
                     "sender": "scammer",
                     "text": msg,
@@ -73,179 +77,105 @@ def test_hindi_scam():
                     "timestamp": int(time.time() * 1000) + 1
                 })
             else:
-                print(f"❌ Error: {response.status_code}")
+                lines.append(f"❌ Error: {response.status_code}")
                 break
-                
+
         except Exception as e:
-            print(f"❌ Exception: {str(e)}")
+            lines.append(f"❌ Exception: {str(e)}")
             break
-        
-        time.sleep(2)
-    
-    print(f"\n{'='*60}")
-    print("✅ Hindi test complete!")
-    print(f"Session ID: {session_id}")
+
+        if REALISTIC:
+            await asyncio.sleep(2)
+
+    lines.append(f"\n{'='*60}")
+    lines.append(f"✅ {name} test complete!")
+    lines.append(f"Session ID: {session_id}")
+
+    return "\n".join(lines)
+
+
+async def test_hindi_scam(client):
+    """
+    Test Hindi language scam detection
+    """
+    return await run_scenario(
+        client,
+        "Hindi Bank Fraud Scam",
+        f"test-hindi-{int(time.time())}",
+        [
+            "आपका बैंक खाता ब्लॉक हो जाएगा। तुरंत वेरिफाई करें।",
+            "अपना अकाउंट नंबर और UPI PIN भेजें।",
+            "9876543210 पर कॉल करें।"
+        ],
+        {
+            "channel": "SMS",
+            "language": "Hindi"
+        }
+    )
 
 
-def test_tamil_scam():
+async def test_tamil_scam(client):
     """
     Test Tamil language scam detection
     """
-    print("\n" + "="*60)
-    print("TEST: Tamil Prize Scam")
-    print("="*60)
-    
-    session_id = f"test-tamil-{int(time.time())}"
-    
-    scammer_messages = [
-        "வாழ்த்துக்கள்! நீங்கள் ரூ.50,000 வென்றுள்ளீர்கள்.",
-        "உடனே winner2024@paytm க்கு பணம் அனுப்புங்கள்.",
-        "இன்று இரவு 12 மணிக்குள் செலுத்தவும்!"
-    ]
-    
-    conversation_history = []
-    
-    for i, msg in enumerate(scammer_messages):
-        print(f"\n{'─'*60}")
-        print(f"Turn {i+1}: Scammer: {msg}")
-        
-        try:
-            response = requests.post(
-                API_URL,
-                headers={
-                    "x-api-key": API_KEY,
-                    "Content-Type": "application/json"
-                },
-                json={
-                    "sessionId": session_id,
-                    "message": {
-                        "sender": "scammer",
-                        "text": msg,
-                        "timestamp": int(time.time() * 1000)
-                    },
-                    "conversationHistory": conversation_history,
-                    "metadata": {
-                        "channel": "WhatsApp",
-                        "language": "Tamil"
-                    }
-                },
-                timeout=30
-            )
-            
-            if response.status_code == 200:
-                data = response.json()
-                print(f"Agent: {data['reply']}")
-                
-                conversation_history.append({
-                    "sender": "scammer",
-                    "text": msg,
-                    "timestamp": int(time.time() * 1000)
-                })
-                conversation_history.append({
-                    "sender": "user",
-                    "text": data['reply'],
-                    "timestamp": int(time.time() * 1000) + 1
-                })
-            else:
-                print(f"❌ Error: {response.status_code}")
-                break
-                
-        except Exception as e:
-            print(f"❌ Exception: {str(e)}")
-            break
-        
-        time.sleep(2)
-    
-    print(f"\n{'='*60}")
-    print("✅ Tamil test complete!")
+    return await run_scenario(
+        client,
+        "Tamil Prize Scam",
+        f"test-tamil-{int(time.time())}",
+        [
+            "வாழ்த்துக்கள்! நீங்கள் ரூ.50,000 வென்றுள்ளீர்கள்.",
+            "உடனே winner2024@paytm க்கு பணம் அனுப்புங்கள்.",
+            "இன்று இரவு 12 மணிக்குள் செலுத்தவும்!"
+        ],
+        {
+            "channel": "WhatsApp",
+            "language": "Tamil"
+        }
+    )
 
 
-def test_spanish_scam():
+async def test_spanish_scam(client):
     """
     Test Spanish language scam detection
     """
-    print("\n" + "="*60)
-    print("TEST: Spanish Emergency Scam")
-    print("="*60)
-    
-    session_id = f"test-spanish-{int(time.time())}"
-    
-    scammer_messages = [
-        "¡Urgente! Su cuenta bancaria será bloqueada.",
-        "Envíe su número de cuenta inmediatamente.",
-        "Llame al 9876543210 ahora mismo."
-    ]
-    
-    conversation_history = []
-    
-    for i, msg in enumerate(scammer_messages):
-        print(f"\n{'─'*60}")
-        print(f"Turn {i+1}: Scammer: {msg}")
-        
-        try:
-            response = requests.post(
-                API_URL,
-                headers={
-                    "x-api-key": API_KEY,
-                    "Content-Type": "application/json"
-                },
-                json={
-                    "sessionId": session_id,
-                    "message": {
-                        "sender": "scammer",
-                        "text": msg,
-                        "timestamp": int(time.time() * 1000)
-                    },
-                    "conversationHistory": conversation_history,
-                    "metadata": {
-                        "channel": "Email",
-                        "language": "Spanish"
-                    }
-                },
-                timeout=30
-            )
-            
-            if response.status_code == 200:
-                data = response.json()
-                print(f"Agent: {data['reply']}")
-                
-                conversation_history.append({
-                    "sender": "scammer",
-                    "text": msg,
-                    "timestamp": int(time.time() * 1000)
-                })
-                conversation_history.append({
-                    "sender": "user",
-                    "text": data['reply'],
-                    "timestamp": int(time.time() * 1000) + 1
-                })
-            else:
-                print(f"❌ Error: {response.status_code}")
-                break
-                
-        except Exception as e:
-            print(f"❌ Exception: {str(e)}")
-            break
-        
-        time.sleep(2)
-    
-    print(f"\n{'='*60}")
-    print("✅ Spanish test complete!")
+    return await run_scenario(
+        client,
+        "Spanish Emergency Scam",
+        f"test-spanish-{int(time.time())}",
+        [
+            "¡Urgente! Su cuenta bancaria será bloqueada.",
+            "Envíe su número de cuenta inmediatamente.",
+            "Llame al 9876543210 ahora mismo."
+        ],
+        {
+            "channel": "Email",
+            "language": "Spanish"
+        }
+    )
+
+
+async def main():
+    async with httpx.AsyncClient(
+        base_url=BASE_URL,
+        headers={"x-api-key": API_KEY},
+        timeout=30
+    ) as client:
+        # Run multilingual tests concurrently
+        transcripts = await asyncio.gather(
+            test_hindi_scam(client),
+            test_tamil_scam(client),
+            test_spanish_scam(client)
+        )
+        for transcript in transcripts:
+            print(transcript)
 
 
 if __name__ == "__main__":
     print("\n🌍 Starting Multilingual Honeypot Tests")
     print("Make sure the server is running on http://localhost:8000\n")
-    
-    # Run multilingual tests
-    test_hindi_scam()
-    time.sleep(3)
-    
-    test_tamil_scam()
-    time.sleep(3)
-    
-    test_spanish_scam()
-    
+
+    asyncio.run(main())
+
     print("\n" + "="*60)
     print("🎉 All multilingual tests complete!")
     print("="*60)
@@ -1,50 +1,58 @@
 """
 Test scenarios for the honeypot system
+
+Scenarios run concurrently over one httpx.AsyncClient, so total
+wall-time is the longest conversation rather than the sum of them.
+Each scenario buffers its own transcript and prints it when finished,
+keeping concurrent output readable. Set REALISTIC=1 to restore the
+human-like 2s pause between messages.
 """
-import requests
-import time
-import json
+import asyncio
 import os
+import time
+
+import httpx
 from dotenv import load_dotenv
 
 # Load environment variables
 load_dotenv()
 
-API_URL = "http://localhost:8000/api/honeypot"
+BASE_URL = "http://localhost:8000"
 API_KEY = os.getenv("API_KEY", "your_honeypot_api_key")
 
+REALISTIC = bool(os.getenv("REALISTIC"))
+
 
-def test_bank_fraud_scam():
+async def run_scenario(client, name, session_id, scammer_messages, metadata,
+                       fetch_session=False):
     """
-    Test bank fraud scam detection and conversation flow
+    Drive one scam conversation and return its printable transcript
+
+    Args:
+        client: Shared httpx.AsyncClient
+        name: Scenario title for the banner
+        session_id: Honeypot session id
+        scammer_messages: Scripted scammer turns
+        metadata: Channel/language metadata for every turn
+        fetch_session: Whether to append extracted intelligence at the end
+
+    Returns:
+        Buffered transcript string for this scenario
     """
-    print("\n" + "="*60)
-    print("TEST: Bank Fraud Scam")
-    print("="*60)
-    
-    session_id = f"test-bank-fraud-{int(time.time())}"
-    
-    scammer_messages = [
-        "Your bank account will be suspended. Verify immediately.",
-        "Click this link to verify: http://fake-bank-verify.com",
-        "Enter your account number and UPI PIN to unlock",
-        "Call this number now: 9876543210",
-        "Pay Rs. 2000 to verify@paytm to unlock account"
-    ]
-    
+    lines = []
+    lines.append("\n" + "="*60)
+    lines.append(f"TEST: {name}")
+    lines.append("="*60)
+
     conversation_history = []
-    
+
     for i, msg in enumerate(scammer_messages):
-        print(f"\n{'─'*60}")
-        print(f"Turn {i+1}: Scammer: {msg}")
-        
+        lines.append(f"\n{'─'*60}")
+        lines.append(f"Turn {i+1}: Scammer: {msg}")
+
         try:
-            response = requests.post(
-                API_URL,
-                headers={
-                    "x-api-key": API_KEY,
-                    "Content-Type": "application/json"
-                },
+            response = await client.post(
+                "/api/honeypot",
                 json={
                     "sessionId": session_id,
                     "message": {
@@ -53,19 +61,14 @@ def test_bank_fraud_scam():
                         "timestamp": int(time.time() * 1000)
                     },
                     "conversationHistory": conversation_history,
-                    "metadata": {
-                        "channel": "SMS",
-                        "language": "English",
-                        "locale": "IN"
-                    }
-                },
-                timeout=30
+                    "metadata": metadata
+                }
             )
-            
+
             if response.status_code == 200:
                 data = response.json()
-                print(f"Agent: {data['reply']}")
-                
+                lines.append(f"Agent: {data['reply']}")
+
                 # Add to conversation history
                 conversation_history.append({
                     "sender": "scammer",
@@ -78,119 +81,91 @@ def test_bank_fraud_scam():
                     "timestamp": int(time.time() * 1000) + 1
                 })
             else:
-                print(f"❌ Error: {response.status_code} - {response.text}")
+                lines.append(f"❌ Error: {response.status_code} - {response.text}")
                 break
-                
+
         except Exception as e:
-            print(f"❌ Exception: {str(e)}")
+            lines.append(f"❌ Exception: {str(e)}")
             break
-        
-        time.sleep(2)  # Realistic delay
-    
-    print(f"\n{'='*60}")
-    print("✅ Bank fraud test complete!")
-    print(f"Session ID: {session_id}")
-    
-    # Get session details
-    try:
-        session_response = requests.get(
-            f"http://localhost:8000/sessions/{session_id}",
-            headers={"x-api-key": API_KEY}
-        )
-        if session_response.status_code == 200:
-            session_data = session_response.json()
-            print(f"\nExtracted Intelligence:")
-            print(f"  - UPI IDs: {session_data['extractedIntelligence']['upiIds']}")
-            print(f"  - Phone Numbers: {session_data['extractedIntelligence']['phoneNumbers']}")
-            print(f"  - Phishing Links: {session_data['extractedIntelligence']['phishingLinks']}")
-            print(f"  - Scam Score: {session_data['scamScore']}")
-    except Exception as e:
-        print(f"⚠️  Could not fetch session details: {e}")
 
+        if REALISTIC:
+            await asyncio.sleep(2)  # Realistic delay
+
+    lines.append(f"\n{'='*60}")
+    lines.append(f"✅ {name} test complete!")
+    lines.append(f"Session ID: {session_id}")
 
-def test_upi_fraud_scam():
+    if fetch_session:
+        # Get session details
+        try:
+            session_response = await client.get(f"/sessions/{session_id}")
+            if session_response.status_code == 200:
+                session_data = session_response.json()
+                lines.append(f"\nExtracted Intelligence:")
+                lines.append(f"  - UPI IDs: {session_data['extractedIntelligence']['upiIds']}")
+                lines.append(f"  - Phone Numbers: {session_data['extractedIntelligence']['phoneNumbers']}")
+                lines.append(f"  - Phishing Links: {session_data['extractedIntelligence']['phishingLinks']}")
+                lines.append(f"  - Scam Score: {session_data['scamScore']}")
+        except Exception as e:
+            lines.append(f"⚠️  Could not fetch session details: {e}")
+
+    return "\n".join(lines)
+
+
+async def test_bank_fraud_scam(client):
+    """
+    Test bank fraud scam detection and conversation flow
+    """
+    return await run_scenario(
+        client,
+        "Bank Fraud Scam",
+        f"test-bank-fraud-{int(time.time())}",
+        [
+            "Your bank account will be suspended. Verify immediately.",
+            "Click this link to verify: http://fake-bank-verify.com",
+            "Enter your account number and UPI PIN to unlock",
+            "Call this number now: 9876543210",
+            "Pay Rs. 2000 to verify@paytm to unlock account"
+        ],
+        {
+            "channel": "SMS",
+            "language": "English",
+            "locale": "IN"
+        },
+        fetch_session=True
+    )
+
+
+async def test_upi_fraud_scam(client):
     """
     Test UPI fraud scam detection
     """
-    print("\n" + "="*60)
-    print("TEST: UPI Fraud Scam")
-    print("="*60)
-    
-    session_id = f"test-upi-fraud-{int(time.time())}"
-    
-    scammer_messages = [
-        "Congratulations! You won Rs. 50,000. Send Rs. 500 processing fee to claim.",
-        "Send money to winner2024@paytm immediately to claim your prize",
-        "Hurry! Offer expires in 2 hours. Pay now!"
-    ]
-    
-    conversation_history = []
-    
-    for i, msg in enumerate(scammer_messages):
-        print(f"\n{'─'*60}")
-        print(f"Turn {i+1}: Scammer: {msg}")
-        
-        try:
-            response = requests.post(
-                API_URL,
-                headers={
-                    "x-api-key": API_KEY,
-                    "Content-Type": "application/json"
-                },
-                json={
-                    "sessionId": session_id,
-                    "message": {
-                        "sender": "scammer",
-                        "text": msg,
-                        "timestamp": int(time.time() * 1000)
-                    },
-                    "conversationHistory": conversation_history,
-                    "metadata": {
-                        "channel": "WhatsApp",
-                        "language": "English"
-                    }
-                },
-                timeout=30
-            )
-            
-            if response.status_code == 200:
-                data = response.json()
-                print(f"Agent: {data['reply']}")
-                
-                conversation_history.append({
-                    "sender": "scammer",
-                    "text": msg,
-                    "timestamp": int(time.time() * 1000)
-                })
-                conversation_history.append({
-                    "sender": "user",
-                    "text": data['reply'],
-                    "timestamp": int(time.time() * 1000) + 1
-                })
-            else:
-                print(f"❌ Error: {response.status_code}")
-                break
-                
-        except Exception as e:
-            print(f"❌ Exception: {str(e)}")
-            break
-        
-        time.sleep(2)
-    
-    print(f"\n{'='*60}")
-    print("✅ UPI fraud test complete!")
+    return await run_scenario(
+        client,
+        "UPI Fraud Scam",
+        f"test-upi-fraud-{int(time.time())}",
+        [
+            "Congratulations! You won Rs. 50,000. Send Rs. 500 processing fee to claim.",
+            "Send money to winner2024@paytm immediately to claim your prize",
+            "Hurry! Offer expires in 2 hours. Pay now!"
+        ],
+        {
+            "channel": "WhatsApp",
+            "language": "English"
+        }
+    )
 
 
-def test_health_check():
+async def test_health_check(client):
     """
     Test health check endpoint
     """
     print("\n" + "="*60)
     print("TEST: Health Check")
     print("="*60)
-    
+
     try:
-        response = requests.get("http://localhost:8000/health")
+        response = await client.get("/health")
         if response.status_code == 200:
             data = response.json()
             print(f"✅ Health check passed:")
@@ -203,19 +178,29 @@ def test_health_check():
         print(f"❌ Exception: {str(e)}")
 
 
+async def main():
+    async with httpx.AsyncClient(
+        base_url=BASE_URL,
+        headers={"x-api-key": API_KEY},
+        timeout=30
+    ) as client:
+        await test_health_check(client)
+
+        # Scenarios run concurrently; transcripts print once complete
+        transcripts = await asyncio.gather(
+            test_bank_fraud_scam(client),
+            test_upi_fraud_scam(client)
+        )
+        for transcript in transcripts:
+            print(transcript)
+
+
 if __name__ == "__main__":
     print("\n🧪 Starting Honeypot System Tests")
     print("Make sure the server is running on http://localhost:8000\n")
-    
-    # Run tests
-    test_health_check()
-    time.sleep(2)
-    
-    test_bank_fraud_scam()
-    time.sleep(3)
-    
-    test_upi_fraud_scam()
-    
+
+    asyncio.run(main())
+
     print("\n" + "="*60)
     print("🎉 All tests complete!")
     print("="*60)
@@ -0,0 +1,119 @@
+"""
+Micro-batching layer for Groq calls (DataLoader pattern)
+
+When many scammer sessions are in flight, each node fires its Groq call
+individually. The batcher collects calls that arrive within a short
+window (default 10ms) and submits them together as one concurrent burst
+over the shared async client, amortizing per-request scheduling and
+connection overhead. Each caller still gets its own response via a
+future.
+"""
+import asyncio
+import os
+
+from utils.groq_client import acall_groq, _parse_json_response
+
+# Collection window before a batch is flushed; 0 disables batching
+BATCH_WINDOW_MS = int(os.getenv("GROQ_BATCH_WINDOW_MS", "10"))
+MAX_BATCH_SIZE = 32
+
+
+class GroqBatcher:
+    """Collects concurrent Groq calls and flushes them in batches"""
+
+    def __init__(self):
+        self._queue = None
+        self._drainer = None
+        self._inflight = set()
+
+    def _ensure_started(self):
+        """Lazily create the queue/drainer on the running event loop"""
+        if self._queue is None:
+            self._queue = asyncio.Queue()
+        # Restart the drainer if it was never started or has died -
+        # otherwise every later caller would await a future that nobody
+        # will ever resolve
+        if self._drainer is None or self._drainer.done():
+            self._drainer = asyncio.ensure_future(self._drain_loop())
+
+    async def load(self, prompt: str, model: str, temperature: float = 0.7,
+                   json_mode: bool = False, system: str = None) -> str:
+        """
+        Queue one Groq call and wait for its result
+
+        Args:
+            prompt: The prompt to send to the model
+            model: Model name from MODELS dict
+            temperature: Sampling temperature (0.0-1.0)
+            json_mode: Whether to request JSON response format
+            system: Optional constant system prompt
+
+        Returns:
+            Model response as string, or None if error
+        """
+        if BATCH_WINDOW_MS <= 0:
+            return await acall_groq(prompt, model, temperature, json_mode=json_mode, system=system)
+
+        self._ensure_started()
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((prompt, model, temperature, json_mode, system, future))
+        return await future
+
+    async def _drain_loop(self):
+        """Collect calls for one window, dispatch, and keep draining"""
+        while True:
+            batch = [await self._queue.get()]
+            await asyncio.sleep(BATCH_WINDOW_MS / 1000.0)
+            while not self._queue.empty() and len(batch) < MAX_BATCH_SIZE:
+                batch.append(self._queue.get_nowait())
+
+            # Fire the batch as its own task and resume draining right
+            # away - calls arriving while a batch is in flight start
+            # their own window instead of queuing behind the previous
+            # round-trip
+            task = asyncio.ensure_future(self._dispatch(batch))
+            self._inflight.add(task)
+            task.add_done_callback(self._inflight.discard)
+
+    async def _dispatch(self, batch):
+        """Run one collected batch as a concurrent burst"""
+        try:
+            results = await asyncio.gather(
+                *[
+                    acall_groq(prompt, model, temperature, json_mode=json_mode, system=system)
+                    for prompt, model, temperature, json_mode, system, _ in batch
+                ],
+                return_exceptions=True
+            )
+        except Exception as e:
+            # gather with return_exceptions shouldn't raise, but a
+            # stuck batch must never strand its callers
+            results = [e] * len(batch)
+
+        for (_, _, _, _, _, future), result in zip(batch, results):
+            if future.done():
+                continue
+            if isinstance(result, Exception):
+                print(f"❌ Groq batch error: {str(result)}")
+                future.set_result(None)
+            else:
+                future.set_result(result)
+
+
+# Shared batcher for the whole process
+_batcher = GroqBatcher()
+
+
+async def batch_call_groq(prompt: str, model: str, temperature: float = 0.7,
+                          json_mode: bool = False, system: str = None) -> str:
+    """Batched counterpart of acall_groq"""
+    return await _batcher.load(prompt, model, temperature, json_mode=json_mode, system=system)
+
+
+async def batch_call_groq_json(prompt: str, model: str, temperature: float = 0.7,
+                               system: str = None) -> dict:
+    """Batched counterpart of acall_groq_json"""
+    response = await _batcher.load(prompt, model, temperature, json_mode=True, system=system)
+    if response:
+        return _parse_json_response(response)
+    return None
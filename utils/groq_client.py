@@ -1,41 +1,142 @@
 """
 Groq API client utilities for ultra-fast LLM inference
 """
+import hashlib
 import json
 import os
-from groq import Groq
+import orjson
+from groq import Groq, AsyncGroq
 from dotenv import load_dotenv
 
 # Load environment variables
 load_dotenv()
 
-# Initialize Groq client
+# Redis-backed memoization for near-deterministic calls: identical
+# classification/extraction prompts at low temperature effectively
+# produce the same verdict, so a Redis GET (~100µs) can stand in for a
+# full inference. Enabled when REDIS_URL is set. The threshold covers
+# the detection/extraction/classification calls (0.2-0.3); response
+# generation (0.8) is sampled for variety and stays live.
+_CACHE_TTL_SECONDS = 86400
+_CACHE_MAX_TEMPERATURE = 0.3
+
+_sync_cache = None
+_async_cache = None
+if os.getenv("REDIS_URL"):
+    try:
+        import redis as _redis
+        import redis.asyncio as _aredis
+        _sync_cache = _redis.from_url(os.getenv("REDIS_URL"))
+        _async_cache = _aredis.from_url(os.getenv("REDIS_URL"))
+    except ImportError:
+        print("⚠️ REDIS_URL set but redis package not installed - LLM memoization off")
+
+
+def _cache_key(prompt: str, model: str, temperature: float, system) -> str:
+    """Stable cache key over everything that shapes the completion"""
+    digest = hashlib.blake2b(
+        f"{model}|{temperature:.2f}|{system or ''}|{prompt}".encode(),
+        digest_size=16
+    ).hexdigest()
+    return f"grq:{digest}"
+
+# Initialize Groq clients (sync for scripts, async for the workflow)
 groq_client = Groq(api_key=os.getenv("GROQ_API_KEY"))
+async_groq_client = AsyncGroq(api_key=os.getenv("GROQ_API_KEY"))
 
 # Model configurations for different tasks
 MODELS = {
     "scam_detection": "llama-3.3-70b-versatile",      # Best for reasoning
     "response_generation": "llama-3.3-70b-versatile",  # Natural language
     "intelligence_extraction": "llama-3.1-8b-instant", # Fast extraction
-    "decision_making": "mixtral-8x7b-32768"           # Large context
+    "decision_making": "mixtral-8x7b-32768",          # Large context
+    "persona_classification": "llama-3.1-8b-instant"  # Simple classification
 }
 
 
-def call_groq(prompt: str, model: str, temperature: float = 0.7, json_mode: bool = False) -> str:
+
+# Single decoder instance reused across calls; raw_decode stops at the
+# end of the first JSON value instead of re-scanning trailing output
+_JSON_DECODER = json.JSONDecoder()
+
+
+def _parse_json_response(response: str) -> dict:
+    """
+    Parse a JSON-mode model response in a single pass
+
+    The common case - a clean JSON object - goes through orjson's C
+    decoder. Responses with trailing prose around the object fall back
+    to raw_decode, which consumes exactly one JSON value and ignores the
+    rest, so near-valid responses don't force a retry.
+
+    Args:
+        response: Raw model output
+
+    Returns:
+        Parsed JSON dict, or None if no JSON object could be decoded
+    """
+    text = response.strip()
+    if text.startswith("```"):
+        # Drop ```json ... ``` fencing some models add despite JSON mode
+        text = text.strip("`")
+        if text.startswith("json"):
+            text = text[4:]
+        text = text.strip()
+
+    start = text.find("{")
+    if start == -1:
+        print("❌ Failed to parse JSON response")
+        return None
+
+    try:
+        return orjson.loads(text[start:] if start else text)
+    except orjson.JSONDecodeError:
+        pass
+
+    try:
+        result, _ = _JSON_DECODER.raw_decode(text, start)
+        return result
+    except json.JSONDecodeError:
+        print("❌ Failed to parse JSON response")
+        return None
+
+
+def call_groq(prompt: str, model: str, temperature: float = 0.7, json_mode: bool = False,
+              system: str = None, bypass_cache: bool = False) -> str:
     """
     Call Groq API with error handling
-    
+
     Args:
         prompt: The prompt to send to the model
         model: Model name from MODELS dict
         temperature: Sampling temperature (0.0-1.0)
         json_mode: Whether to request JSON response format
-        
+        system: Optional constant system prompt, sent as a separate
+            message so the provider's prompt-prefix cache can reuse it
+        bypass_cache: Skip Redis memoization even for deterministic calls
+
     Returns:
         Model response as string, or None if error
     """
+    memoize = (
+        _sync_cache is not None
+        and not bypass_cache
+        and temperature <= _CACHE_MAX_TEMPERATURE
+    )
+    key = _cache_key(prompt, model, temperature, system) if memoize else None
+    if memoize:
+        try:
+            cached = _sync_cache.get(key)
+            if cached is not None:
+                return cached.decode()
+        except Exception as e:
+            print(f"⚠️ LLM cache read failed: {str(e)}")
+
     try:
-        messages = [{"role": "user", "content": prompt}]
+        messages = []
+        if system:
+            messages.append({"role": "system", "content": system})
+        messages.append({"role": "user", "content": prompt})
         
         response = groq_client.chat.completions.create(
             model=model,
@@ -44,30 +145,108 @@ def call_groq(prompt: str, model: str, temperature: float = 0.7, json_mode: bool
             max_tokens=2048,
             response_format={"type": "json_object"} if json_mode else {"type": "text"}
         )
-        
-        return response.choices[0].message.content
+
+        content = response.choices[0].message.content
+        if memoize and content:
+            try:
+                _sync_cache.set(key, content, ex=_CACHE_TTL_SECONDS)
+            except Exception as e:
+                print(f"⚠️ LLM cache write failed: {str(e)}")
+        return content
     except Exception as e:
         print(f"❌ Groq API error: {str(e)}")
         return None
 
 
-def call_groq_json(prompt: str, model: str, temperature: float = 0.7) -> dict:
+def call_groq_json(prompt: str, model: str, temperature: float = 0.7, system: str = None) -> dict:
     """
     Call Groq and parse JSON response
-    
+
     Args:
         prompt: The prompt to send to the model
         model: Model name from MODELS dict
         temperature: Sampling temperature (0.0-1.0)
-        
+        system: Optional constant system prompt (see call_groq)
+
     Returns:
         Parsed JSON dict, or None if error
     """
-    response = call_groq(prompt, model, temperature, json_mode=True)
+    response = call_groq(prompt, model, temperature, json_mode=True, system=system)
     if response:
+        return _parse_json_response(response)
+    return None
+
+
+async def acall_groq(prompt: str, model: str, temperature: float = 0.7, json_mode: bool = False,
+                     system: str = None, bypass_cache: bool = False) -> str:
+    """
+    Async variant of call_groq - lets independent LLM calls run concurrently
+
+    Args:
+        prompt: The prompt to send to the model
+        model: Model name from MODELS dict
+        temperature: Sampling temperature (0.0-1.0)
+        json_mode: Whether to request JSON response format
+        system: Optional constant system prompt (see call_groq)
+        bypass_cache: Skip Redis memoization even for deterministic calls
+
+    Returns:
+        Model response as string, or None if error
+    """
+    memoize = (
+        _async_cache is not None
+        and not bypass_cache
+        and temperature <= _CACHE_MAX_TEMPERATURE
+    )
+    key = _cache_key(prompt, model, temperature, system) if memoize else None
+    if memoize:
         try:
-            return json.loads(response)
-        except json.JSONDecodeError:
-            print("❌ Failed to parse JSON response")
-            return None
+            cached = await _async_cache.get(key)
+            if cached is not None:
+                return cached.decode()
+        except Exception as e:
+            print(f"⚠️ LLM cache read failed: {str(e)}")
+
+    try:
+        messages = []
+        if system:
+            messages.append({"role": "system", "content": system})
+        messages.append({"role": "user", "content": prompt})
+
+        response = await async_groq_client.chat.completions.create(
+            model=model,
+            messages=messages,
+            temperature=temperature,
+            max_tokens=2048,
+            response_format={"type": "json_object"} if json_mode else {"type": "text"}
+        )
+
+        content = response.choices[0].message.content
+        if memoize and content:
+            try:
+                await _async_cache.set(key, content, ex=_CACHE_TTL_SECONDS)
+            except Exception as e:
+                print(f"⚠️ LLM cache write failed: {str(e)}")
+        return content
+    except Exception as e:
+        print(f"❌ Groq API error: {str(e)}")
+        return None
+
+
+async def acall_groq_json(prompt: str, model: str, temperature: float = 0.7, system: str = None) -> dict:
+    """
+    Async variant of call_groq_json
+
+    Args:
+        prompt: The prompt to send to the model
+        model: Model name from MODELS dict
+        temperature: Sampling temperature (0.0-1.0)
+        system: Optional constant system prompt (see call_groq)
+
+    Returns:
+        Parsed JSON dict, or None if error
+    """
+    response = await acall_groq(prompt, model, temperature, json_mode=True, system=system)
+    if response:
+        return _parse_json_response(response)
     return None
@@ -0,0 +1,120 @@
+"""
+Aho-Corasick keyword scanner for multilingual fallback detection
+
+The fallback branch of scam detection checks a keyword list with one
+substring scan per keyword - O(keywords x text). An Aho-Corasick
+automaton finds every keyword in a single O(text) pass, so the keyword
+list can grow (more languages, more phrases) without the scan getting
+slower. Pure stdlib so it works in the serverless deployment.
+"""
+from collections import deque
+from typing import List
+
+
+class KeywordScanner:
+    """Multi-pattern substring scanner (Aho-Corasick automaton)"""
+
+    def __init__(self, keywords: List[str]):
+        """
+        Build the automaton from a keyword list
+
+        Args:
+            keywords: Substrings to match (matched case-insensitively)
+        """
+        # Trie: state -> {char: next_state}; outputs: state -> keyword
+        self._goto = [{}]
+        self._output = [None]
+        self._fail = [0]
+        # Nearest fail-chain state that ends a keyword (0 = none), so
+        # matches nested inside longer matches are still reported
+        self._dict_suffix = [0]
+
+        for keyword in keywords:
+            self._add(keyword.lower())
+        self._build_failure_links()
+
+    def _add(self, keyword: str):
+        """Insert one keyword into the trie"""
+        state = 0
+        for char in keyword:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                self._goto.append({})
+                self._output.append(None)
+                self._fail.append(0)
+                self._dict_suffix.append(0)
+                next_state = len(self._goto) - 1
+                self._goto[state][char] = next_state
+            state = next_state
+        self._output[state] = keyword
+
+    def _build_failure_links(self):
+        """BFS pass wiring failure transitions and dictionary-suffix links"""
+        queue = deque()
+        for next_state in self._goto[0].values():
+            queue.append(next_state)
+
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fail = self._fail[state]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[next_state] = self._goto[fail].get(char, 0)
+                if self._fail[next_state] == next_state:
+                    self._fail[next_state] = 0
+
+                fail_state = self._fail[next_state]
+                if self._output[fail_state] is not None:
+                    self._dict_suffix[next_state] = fail_state
+                else:
+                    self._dict_suffix[next_state] = self._dict_suffix[fail_state]
+
+    def find_all(self, text: str) -> List[str]:
+        """
+        Find all keywords present in the text in one pass
+
+        Args:
+            text: Text to scan (lowercased internally)
+
+        Returns:
+            Unique matched keywords, in order of first occurrence
+        """
+        state = 0
+        found = []
+        seen = set()
+        for char in text.lower():
+            while state and char not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(char, 0)
+
+            # Report the match at this state plus any keyword matches
+            # ending here as suffixes of longer keywords
+            out_state = state if self._output[state] is not None else self._dict_suffix[state]
+            while out_state:
+                keyword = self._output[out_state]
+                if keyword not in seen:
+                    seen.add(keyword)
+                    found.append(keyword)
+                out_state = self._dict_suffix[out_state]
+        return found
+
+    def contains_any(self, text: str) -> bool:
+        """
+        Check whether any keyword occurs in the text
+
+        Args:
+            text: Text to scan (lowercased internally)
+
+        Returns:
+            True on the first keyword hit
+        """
+        state = 0
+        for char in text.lower():
+            while state and char not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(char, 0)
+            if self._output[state] is not None or self._dict_suffix[state]:
+                return True
+        return False
@@ -0,0 +1,120 @@
+"""
+Lightweight LLM response cache for high-volume detection calls
+
+Scammers reuse near-identical openings ("Your account is blocked, verify
+OTP..."), so the scam detection path can skip the Groq round-trip for
+messages we have already classified. Keys are normalized (lowercased,
+whitespace-collapsed, punctuation and digits stripped) so reworded
+amounts/numbers and punctuation changes collapse to the same key, and
+remaining near-duplicates are matched with a token-set similarity check.
+"""
+import string
+import time
+from collections import OrderedDict
+
+# Cache sizing and freshness limits
+MAX_ENTRIES = 1000
+TTL_SECONDS = 30 * 60
+
+# Near-duplicate matching: scan at most this many recent entries. The
+# threshold tolerates roughly one reworded token in a short opening -
+# punctuation/digit noise is already gone by normalization
+FUZZY_SCAN_LIMIT = 128
+FUZZY_THRESHOLD = 0.85
+
+# Punctuation and digits carry no signal for matching repeated scam
+# scripts (amounts, account numbers, and commas vary per victim)
+_NOISE = str.maketrans('', '', string.punctuation + string.digits)
+
+# key -> (expires_at, token_set, cached_value)
+_cache = OrderedDict()
+
+
+def normalize_key(*parts) -> str:
+    """
+    Build a normalized cache key from message text and context parts
+
+    Args:
+        *parts: Strings to include in the key (message, channel, language)
+
+    Returns:
+        Lowercased, whitespace-collapsed key string with punctuation
+        and digits removed
+    """
+    normalized = (
+        " ".join(str(part).lower().translate(_NOISE).split())
+        for part in parts if part
+    )
+    return " | ".join(part for part in normalized if part)
+
+
+def _token_similarity(tokens_a: frozenset, tokens_b: frozenset) -> float:
+    """Jaccard similarity between two token sets"""
+    if not tokens_a or not tokens_b:
+        return 0.0
+    overlap = len(tokens_a & tokens_b)
+    return overlap / len(tokens_a | tokens_b)
+
+
+def _evict_expired(now: float):
+    """Drop expired entries and enforce the size bound (LRU order)"""
+    while _cache:
+        oldest_key = next(iter(_cache))
+        expires_at = _cache[oldest_key][0]
+        if expires_at <= now or len(_cache) > MAX_ENTRIES:
+            _cache.popitem(last=False)
+        else:
+            break
+
+
+def get(key: str):
+    """
+    Look up a cached LLM result by normalized key
+
+    Tries an exact match first, then scans recent entries for a
+    near-duplicate (token-set similarity >= FUZZY_THRESHOLD).
+
+    Args:
+        key: Normalized key from normalize_key()
+
+    Returns:
+        Cached value, or None on miss
+    """
+    now = time.time()
+
+    entry = _cache.get(key)
+    if entry is not None:
+        expires_at, _, value = entry
+        if expires_at > now:
+            _cache.move_to_end(key)
+            return value
+        del _cache[key]
+
+    # Fuzzy pass over the most recent entries
+    tokens = frozenset(key.split())
+    scanned = 0
+    for cached_key in reversed(_cache):
+        if scanned >= FUZZY_SCAN_LIMIT:
+            break
+        scanned += 1
+        expires_at, cached_tokens, value = _cache[cached_key]
+        if expires_at <= now:
+            continue
+        if _token_similarity(tokens, cached_tokens) >= FUZZY_THRESHOLD:
+            return value
+
+    return None
+
+
+def put(key: str, value):
+    """
+    Store an LLM result under a normalized key
+
+    Args:
+        key: Normalized key from normalize_key()
+        value: Parsed LLM result to cache
+    """
+    now = time.time()
+    _cache[key] = (now + TTL_SECONDS, frozenset(key.split()), value)
+    _cache.move_to_end(key)
+    _evict_expired(now)
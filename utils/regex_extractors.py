@@ -2,38 +2,85 @@
 Regex-based intelligence extraction utilities
 """
 import re
-from typing import List, Tuple
+from typing import Dict, List
+
+# Patterns compiled once at import time, one alternation per family -
+# each extractor makes a single pass over the text instead of one pass
+# per sub-pattern
+
+# Bank account numbers (formatted first so separators are captured as
+# part of the match) and IFSC codes
+_ACCOUNT_PATTERN = re.compile(
+    r'\b\d{4}[-\s]?\d{4}[-\s]?\d{4,6}\b'  # Formatted account
+    r'|\b\d{9,18}\b'  # Account numbers (9-18 digits)
+    r'|[A-Z]{4}0[A-Z0-9]{6}'  # IFSC codes
+)
+
+# UPI IDs (email-like format)
+_UPI_PATTERN = re.compile(r'\b[\w\.-]+@[\w\.-]+\b')
+
+# Known UPI provider handles - checked by O(1) membership on the
+# post-'@' segment, with a prefix pass for bank handles like okhdfcbank
+_UPI_PROVIDERS = frozenset({
+    'paytm', 'phonepe', 'googlepay', 'gpay', 'ybl', 'axl',
+    'okhdfcbank', 'oksbi', 'okicici', 'ibl', 'upi'
+})
+
+# Phone numbers (Indian format; +91 first so the bare 10-digit
+# alternative doesn't re-match the tail of a prefixed number)
+_PHONE_PATTERN = re.compile(
+    r'\+91[-\s]?\d{10}'  # +91 format
+    r'|\b[6-9]\d{9}\b'  # 10 digit Indian mobile
+)
+_CLEAN_RE = re.compile(r'[-\s]')  # Separators stripped from matches
+
+# Account-number cleanup/masking: translate strips separators in one C
+# pass, and masks are sliced from a precomputed run instead of building
+# a fresh 'X'*N string per match
+_STRIP = str.maketrans('', '', '- ')
+_X = 'X' * 32
+
+# Cheap containment probes - a byte scan is far cheaper than regex DFA
+# startup, and many multilingual messages can't contain a given artifact
+# at all (pure Devanagari/Tamil text has no digits or ASCII UPI handles)
+_HAS_DIGIT = re.compile(r'\d').search
+_URL_MARKERS = ('http', 'bit.ly', 'tinyurl.com', 'goo.gl', 't.co')
+
+# Full URLs and common shorteners in one scan; bare shortener links are
+# recognized by not starting with http. The URL alternative is a single
+# negated character class - no per-character alternation to backtrack
+# through, and no accidental '$'-'_' range like the old pattern had
+_URL_PATTERN = re.compile(
+    r'https?://[^\s<>"\'\)]+'
+    r'|\b(?:bit\.ly|tinyurl\.com|goo\.gl|t\.co)/[A-Za-z0-9]+'
+)
 
 
 def extract_bank_accounts(text: str) -> List[str]:
     """
     Extract bank account numbers and IFSC codes
-    
+
     Args:
         text: Text to search
-        
+
     Returns:
         List of masked bank account numbers
     """
+    if not text or _HAS_DIGIT(text) is None:
+        return []
+
     accounts = []
-    
-    # Patterns for bank account numbers
-    patterns = [
-        r'\b\d{9,18}\b',  # Account numbers (9-18 digits)
-        r'\b\d{4}[-\s]?\d{4}[-\s]?\d{4,6}\b',  # Formatted account
-        r'[A-Z]{4}0[A-Z0-9]{6}',  # IFSC codes
-    ]
-    
-    for pattern in patterns:
-        matches = re.findall(pattern, text)
-        for match in matches:
-            cleaned = match.replace("-", "").replace(" ", "")
-            if len(cleaned) >= 9:
-                # Mask for privacy: show first 4 and last 4 digits
-                masked = f"{cleaned[:4]}-{'X'*(len(cleaned)-8)}-{cleaned[-4:]}"
-                if masked not in accounts:
-                    accounts.append(masked)
-    
+    seen = set()
+
+    for match in _ACCOUNT_PATTERN.findall(text):
+        cleaned = match.translate(_STRIP)
+        if len(cleaned) >= 9:
+            # Mask for privacy: show first 4 and last 4 digits
+            masked = f"{cleaned[:4]}-{_X[:len(cleaned)-8]}-{cleaned[-4:]}"
+            if masked not in seen:
+                seen.add(masked)
+                accounts.append(masked)
+
     return accounts
 
 
@@ -47,25 +94,24 @@ def extract_upi_ids(text: str) -> List[str]:
     Returns:
         List of UPI IDs
     """
+    if '@' not in text:
+        return []
+
     upi_ids = []
-    
-    # Pattern for UPI IDs (email-like format)
-    upi_pattern = r'\b[\w\.-]+@[\w\.-]+\b'
-    matches = re.findall(upi_pattern, text)
-    
-    # Common UPI providers
-    upi_providers = [
-        'paytm', 'phonepe', 'googlepay', 'gpay', 'ybl', 'axl',
-        'okhdfcbank', 'oksbi', 'okicici', 'ibl', 'upi'
-    ]
-    
-    for match in matches:
-        if '@' in match:
-            # Check if it's a known UPI provider
-            if any(provider in match.lower() for provider in upi_providers):
-                if match not in upi_ids:
-                    upi_ids.append(match)
-    
+    seen = set()
+
+    for match in _UPI_PATTERN.findall(text):
+        handle, _, domain = match.rpartition('@')
+        if not handle:
+            continue
+        # Check the post-'@' segment against known providers: exact
+        # membership first, prefix match for suffixed bank handles
+        domain = domain.lower()
+        if domain in _UPI_PROVIDERS or any(domain.startswith(p) for p in _UPI_PROVIDERS):
+            if match not in seen:
+                seen.add(match)
+                upi_ids.append(match)
+
     return upi_ids
 
 
@@ -79,23 +125,21 @@ def extract_phone_numbers(text: str) -> List[str]:
     Returns:
         List of phone numbers in +91 format
     """
+    if not text or _HAS_DIGIT(text) is None:
+        return []
+
     phones = []
-    
-    patterns = [
-        r'\+91[-\s]?\d{10}',  # +91 format
-        r'\b[6-9]\d{9}\b',  # 10 digit Indian mobile
-    ]
-    
-    for pattern in patterns:
-        matches = re.findall(pattern, text)
-        for phone in matches:
-            cleaned = re.sub(r'[-\s]', '', phone)
-            # Ensure it starts with +91
-            if len(cleaned) == 10:
-                cleaned = f"+91{cleaned}"
-            if cleaned not in phones:
-                phones.append(cleaned)
-    
+    seen = set()
+
+    for phone in _PHONE_PATTERN.findall(text):
+        cleaned = _CLEAN_RE.sub('', phone)
+        # Ensure it starts with +91
+        if len(cleaned) == 10:
+            cleaned = f"+91{cleaned}"
+        if cleaned not in seen:
+            seen.add(cleaned)
+            phones.append(cleaned)
+
     return phones
 
 
@@ -109,20 +153,41 @@ def extract_urls(text: str) -> List[str]:
     Returns:
         List of URLs
     """
+    if not any(marker in text for marker in _URL_MARKERS):
+        return []
+
     urls = []
-    
-    # Full URL pattern
-    url_pattern = r'http[s]?://(?:[a-zA-Z]|[0-9]|[$-_@.&+]|[!*\\(\\),]|(?:%[0-9a-fA-F][0-9a-fA-F]))+'
-    url_matches = re.findall(url_pattern, text)
-    urls.extend(url_matches)
-    
-    # Shortened URL pattern
-    short_url_pattern = r'\b(?:bit\.ly|tinyurl\.com|goo\.gl|t\.co)/[A-Za-z0-9]+'
-    short_urls = re.findall(short_url_pattern, text)
-    
-    for url in short_urls:
-        full_url = f"http://{url}" if not url.startswith('http') else url
-        if full_url not in urls:
+    seen = set()
+
+    for url in _URL_PATTERN.findall(text):
+        # Shortener matches come back without a scheme
+        full_url = url if url.startswith('http') else f"http://{url}"
+        if full_url not in seen:
+            seen.add(full_url)
             urls.append(full_url)
-    
+
     return urls
+
+
+def extract_all(text: str) -> Dict[str, List[str]]:
+    """
+    Run every extractor over the text in one call
+
+    Each extractor short-circuits on its own containment probe (digits
+    for accounts/phones, '@' for UPI IDs, URL markers for links), so a
+    message that can't contain a given artifact skips that regex scan
+    entirely.
+
+    Args:
+        text: Text to search
+
+    Returns:
+        Dict with bankAccounts, upiIds, phishingLinks and phoneNumbers
+        lists (same keys as extractedIntelligence)
+    """
+    return {
+        "bankAccounts": extract_bank_accounts(text),
+        "upiIds": extract_upi_ids(text),
+        "phishingLinks": extract_urls(text),
+        "phoneNumbers": extract_phone_numbers(text),
+    }
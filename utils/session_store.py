@@ -0,0 +1,192 @@
+"""
+Session state storage backends
+
+The in-process `sessions = {}` dict ties the API to a single worker:
+state is lost on restart, grows without bound, and cannot be shared when
+uvicorn forks multiple workers. When REDIS_URL is set, session state is
+kept in Redis with a 24h TTL (msgpack-serialized, O(1) GET/SET) so
+workers scale horizontally and memory is bounded by expiry. Without
+REDIS_URL the store falls back to a plain dict for local development.
+"""
+import asyncio
+import os
+import time
+from collections import OrderedDict
+
+import orjson
+
+# Sessions expire a day after the last message
+SESSION_TTL_SECONDS = 24 * 60 * 60
+
+# Cap for the in-memory fallback store (Redis bounds itself via EXPIRE)
+MAX_SESSIONS = 100_000
+
+# Lock registry is pruned once it outgrows this
+_MAX_IDLE_LOCKS = 1024
+
+_KEY_PREFIX = "session:"
+
+
+class _LockRegistry:
+    """
+    Per-session asyncio locks, created lazily
+
+    Two concurrent requests for the same session would otherwise
+    interleave their read-modify-write cycles and corrupt state. Idle
+    locks are pruned once the registry outgrows its bound.
+    """
+
+    def __init__(self):
+        self._locks = {}
+
+    def get(self, session_id: str) -> asyncio.Lock:
+        lock = self._locks.get(session_id)
+        if lock is None:
+            if len(self._locks) >= _MAX_IDLE_LOCKS:
+                # A lock is in use if it's held OR has queued waiters:
+                # release() clears the held flag before a waiter wakes,
+                # so checking locked() alone could prune a contended
+                # lock mid-handoff and let two turns run concurrently
+                self._locks = {
+                    sid: l for sid, l in self._locks.items()
+                    if l.locked() or l._waiters
+                }
+            lock = self._locks[session_id] = asyncio.Lock()
+        return lock
+
+
+class InMemorySessionStore:
+    """
+    Dict-backed store for local development (single worker only)
+
+    Bounded like the LLM cache: LRU order with per-session expiry, so a
+    long-running server doesn't leak memory for abandoned sessions.
+    """
+
+    def __init__(self):
+        # session_id -> (expires_at, state), most recent last
+        self._sessions = OrderedDict()
+        self._locks = _LockRegistry()
+
+    def lock(self, session_id: str) -> asyncio.Lock:
+        """Per-session lock serializing read-modify-write cycles"""
+        return self._locks.get(session_id)
+
+    def _evict(self, now: float):
+        """Drop expired sessions and enforce the size bound (LRU order)"""
+        while self._sessions:
+            oldest_id = next(iter(self._sessions))
+            expires_at = self._sessions[oldest_id][0]
+            if expires_at <= now or len(self._sessions) > MAX_SESSIONS:
+                self._sessions.popitem(last=False)
+            else:
+                break
+
+    async def get(self, session_id: str):
+        """Return the session state dict, or None if unknown/expired"""
+        entry = self._sessions.get(session_id)
+        if entry is None:
+            return None
+        expires_at, state = entry
+        if expires_at <= time.time():
+            del self._sessions[session_id]
+            return None
+        self._sessions.move_to_end(session_id)
+        return state
+
+    async def set(self, session_id: str, state: dict):
+        """Store the session state dict, refreshing its TTL"""
+        now = time.time()
+        self._sessions[session_id] = (now + SESSION_TTL_SECONDS, state)
+        self._sessions.move_to_end(session_id)
+        self._evict(now)
+
+    async def count(self) -> int:
+        """Number of active sessions"""
+        self._evict(time.time())
+        return len(self._sessions)
+
+
+class StateCodec:
+    """
+    Serializer for session state blobs
+
+    msgpack encodes the nested state dict 2-3x smaller than JSON and
+    decodes faster, cutting Redis bandwidth per turn as conversations
+    grow; orjson remains the fallback when msgpack isn't installed.
+    """
+
+    def __init__(self):
+        try:
+            import msgpack
+            self._msgpack = msgpack
+        except ImportError:
+            self._msgpack = None
+
+    def dumps(self, state: dict) -> bytes:
+        if self._msgpack is not None:
+            return self._msgpack.packb(state, use_bin_type=True)
+        return orjson.dumps(state)
+
+    def loads(self, raw: bytes) -> dict:
+        if self._msgpack is not None:
+            return self._msgpack.unpackb(raw, raw=False)
+        return orjson.loads(raw)
+
+
+class RedisSessionStore:
+    """Redis-backed store with per-session TTL (multi-worker safe)"""
+
+    def __init__(self, url: str):
+        import redis.asyncio as redis
+        self._redis = redis.from_url(url)
+        self._locks = _LockRegistry()
+        self._codec = StateCodec()
+
+    def lock(self, session_id: str) -> asyncio.Lock:
+        """Per-session lock serializing read-modify-write cycles
+
+        Process-local: it protects against concurrent turns for the
+        same session landing on the same worker, which is the common
+        case with connection keep-alive.
+        """
+        return self._locks.get(session_id)
+
+    async def get(self, session_id: str):
+        """Return the session state dict, or None if unknown/expired"""
+        raw = await self._redis.get(f"{_KEY_PREFIX}{session_id}")
+        return self._codec.loads(raw) if raw else None
+
+    async def set(self, session_id: str, state: dict):
+        """Store the session state dict, refreshing its TTL"""
+        await self._redis.set(
+            f"{_KEY_PREFIX}{session_id}",
+            self._codec.dumps(state),
+            ex=SESSION_TTL_SECONDS
+        )
+
+    async def count(self) -> int:
+        """Number of active sessions (SCAN over the session keyspace)"""
+        total = 0
+        async for _ in self._redis.scan_iter(match=f"{_KEY_PREFIX}*"):
+            total += 1
+        return total
+
+
+def get_session_store():
+    """
+    Build the session store for this process
+
+    Returns:
+        RedisSessionStore when REDIS_URL is set (and the redis package is
+        installed), otherwise InMemorySessionStore
+    """
+    url = os.getenv("REDIS_URL")
+    if url:
+        try:
+            store = RedisSessionStore(url)
+            print(f"🗄️ Using Redis session store")
+            return store
+        except ImportError:
+            print("⚠️ REDIS_URL set but redis package not installed - using in-memory sessions")
+    return InMemorySessionStore()
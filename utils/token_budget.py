@@ -0,0 +1,77 @@
+"""
+Token-budget-aware conversation history truncation
+
+Fixed history[-K:] slices grow prompts with message length, not token
+cost. These helpers keep the most recent messages that fit a token
+budget and note how many earlier turns were dropped, so prompt size
+stays bounded no matter how long the session runs.
+"""
+
+# Rough average for Llama-family tokenizers; good enough for bounding
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimate the token count of a text
+
+    Args:
+        text: Text to measure
+
+    Returns:
+        Approximate number of tokens (never less than 1)
+    """
+    return max(1, len(text) // CHARS_PER_TOKEN)
+
+
+def fit_lines(lines: list, budget_tokens: int) -> str:
+    """
+    Join pre-formatted history lines into a token-bounded string
+
+    Walks the lines newest-first, keeping whole lines until the budget
+    is exhausted, then prepends a one-line marker for anything omitted.
+
+    Args:
+        lines: Pre-formatted "sender: text" lines (oldest first)
+        budget_tokens: Approximate token budget for the joined string
+
+    Returns:
+        Bounded history string (oldest kept line first), or "" if
+        lines is empty
+    """
+    if not lines:
+        return ""
+
+    kept = []
+    remaining = budget_tokens
+    for line in reversed(lines):
+        cost = estimate_tokens(line)
+        if cost > remaining and kept:
+            break
+        kept.append(line)
+        remaining -= cost
+
+    kept.reverse()
+    omitted = len(lines) - len(kept)
+    if omitted > 0:
+        kept.insert(0, f"[{omitted} earlier messages omitted]")
+
+    return "\n".join(kept)
+
+
+def fit_history(history: list, budget_tokens: int) -> str:
+    """
+    Format conversation history into a string bounded by a token budget
+
+    Args:
+        history: List of message dicts with "sender" and "text" keys
+        budget_tokens: Approximate token budget for the formatted string
+
+    Returns:
+        Formatted history string (oldest kept message first), or ""
+        if history is empty
+    """
+    return fit_lines(
+        [f"{msg['sender']}: {msg['text']}" for msg in history],
+        budget_tokens
+    )